@@ -3,32 +3,30 @@
 Archive schema versions when template.yaml is updated.
 Ensures all versions are preserved in the schemas directory.
 """
-import yaml
+import functools
 import sys
 import shutil
 from pathlib import Path
 
-def load_yaml(file_path):
-    """Load YAML file and return its content."""
-    with open(file_path, 'r') as f:
-        return yaml.safe_load(f)
+from schema_cache import load_yaml, write_json_cache
 
-def save_yaml(data, file_path):
-    """Save data to YAML file."""
-    with open(file_path, 'w') as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE_PATH = _ROOT / 'template.yaml'
+SCHEMAS_DIR = _ROOT / 'schemas'
+
+@functools.lru_cache(maxsize=None)
+def _parse_ver(version):
+    """Return a sortable tuple of ints for a dotted version string."""
+    return tuple(int(part) for part in version.split('.'))
 
 def main():
     """Main archive function."""
-    template_path = Path(__file__).parent.parent / 'template.yaml'
-    schemas_dir = Path(__file__).parent.parent / 'schemas'
-    
     # Create schemas directory if it doesn't exist
-    schemas_dir.mkdir(exist_ok=True)
+    SCHEMAS_DIR.mkdir(exist_ok=True)
     
     # Load current template
     try:
-        current_template = load_yaml(template_path)
+        current_template = load_yaml(TEMPLATE_PATH)
     except Exception as e:
         print(f"Error loading template.yaml: {e}")
         sys.exit(1)
@@ -39,12 +37,17 @@ def main():
         sys.exit(1)
     
     version = current_template['version']
-    archive_path = schemas_dir / f"v{version}.yaml"
+    archive_path = SCHEMAS_DIR / f"v{version}.yaml"
     
     # Check if this version already exists
     if archive_path.exists():
         # Compare content to see if it's the same
         try:
+            # Identical bytes need no parse or deep compare
+            if archive_path.read_bytes() == TEMPLATE_PATH.read_bytes():
+                print(f"Schema version {version} already archived and unchanged.")
+                sys.exit(0)
+            
             existing_content = load_yaml(archive_path)
             if existing_content == current_template:
                 print(f"Schema version {version} already archived and unchanged.")
@@ -59,26 +62,25 @@ def main():
     
     # Archive the current version
     try:
-        shutil.copy2(template_path, archive_path)
+        shutil.copyfile(TEMPLATE_PATH, archive_path)
         print(f"✓ Archived schema version {version} to {archive_path}")
     except Exception as e:
         print(f"Error archiving schema: {e}")
         sys.exit(1)
     
+    # Side-cache the parsed schema as JSON, which loads much faster than YAML
+    write_json_cache(archive_path, current_template)
+    
     # Create/update version index
-    index_path = schemas_dir / 'versions.txt'
-    versions = []
+    index_path = SCHEMAS_DIR / 'versions.txt'
+    versions = set()
     
     if index_path.exists():
-        with open(index_path, 'r') as f:
-            versions = [line.strip() for line in f if line.strip()]
+        versions = set(index_path.read_text().split())
     
     if version not in versions:
-        versions.append(version)
-        versions.sort(key=lambda v: list(map(int, v.split('.'))))
-        
-        with open(index_path, 'w') as f:
-            f.write('\n'.join(versions) + '\n')
+        versions.add(version)
+        index_path.write_text('\n'.join(sorted(versions, key=_parse_ver)) + '\n')
     
     sys.exit(0)
 
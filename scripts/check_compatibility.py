@@ -3,86 +3,179 @@
 Check backwards compatibility of template.yaml changes.
 Ensures all required fields from previous versions remain present.
 """
-import yaml
+import functools
 import sys
 import os
+from collections import deque
 from pathlib import Path
 
-def load_yaml(file_path):
-    """Load YAML file and return its content."""
-    with open(file_path, 'r') as f:
-        return yaml.safe_load(f)
+from schema_cache import load_yaml
 
-def get_schema_structure(data, path=""):
+_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE_PATH = _ROOT / 'template.yaml'
+SCHEMAS_DIR = _ROOT / 'schemas'
+
+@functools.lru_cache(maxsize=None)
+def _parse_ver(version):
+    """Return a sortable tuple of ints for a dotted version string."""
+    return tuple(int(part) for part in version.split('.'))
+
+def get_schema_structure(data):
     """Extract the structure of a YAML schema, including field types."""
     structure = {}
+    # Walk with an explicit stack of (output dict, source node) pairs
+    stack = deque([(structure, data)])
     
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_path = f"{path}.{key}" if path else key
+    while stack:
+        out, node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        
+        for key, value in node.items():
             if isinstance(value, dict):
-                structure[key] = {
-                    'type': 'dict',
-                    'fields': get_schema_structure(value, current_path)
-                }
+                fields = {}
+                out[key] = {'type': 'dict', 'fields': fields}
+                stack.append((fields, value))
             elif isinstance(value, list):
-                structure[key] = {
-                    'type': 'list',
-                    'item_structure': get_schema_structure(value[0], current_path) if value else None
-                }
+                if value:
+                    item_structure = {}
+                    stack.append((item_structure, value[0]))
+                else:
+                    item_structure = None
+                out[key] = {'type': 'list', 'item_structure': item_structure}
             else:
-                structure[key] = {'type': type(value).__name__}
+                out[key] = {'type': type(value).__name__}
     
     return structure
 
-def check_field_compatibility(old_struct, new_struct, path=""):
-    """Check if new structure is compatible with old structure."""
-    errors = []
+def intern_structure(struct, pool):
+    """Collapse structurally identical sub-structures into one shared instance.
+    
+    Children are interned first, so a node can be keyed on its children's ids.
+    """
+    interned = {}
+    key = []
+    
+    for field, spec in struct.items():
+        spec = dict(spec)
+        fields = spec.get('fields')
+        if fields is not None:
+            spec['fields'] = intern_structure(fields, pool)
+        item_structure = spec.get('item_structure')
+        if item_structure is not None:
+            spec['item_structure'] = intern_structure(item_structure, pool)
+        interned[field] = spec
+        key.append((
+            field,
+            spec['type'],
+            id(spec.get('fields')),
+            id(spec.get('item_structure')),
+        ))
+    
+    return pool.setdefault(tuple(key), interned)
+
+# Shared stand-in for a missing 'fields' entry, so its id() is stable in memo keys
+_NO_FIELDS = {}
+
+def _find_incompatibilities(old_struct, new_struct, memo):
+    """Return (relative_path_parts, type_change) pairs; type_change is None for removed fields."""
+    if old_struct is new_struct:
+        return ()
+    
+    key = (id(old_struct), id(new_struct))
+    cached = memo.get(key)
+    if cached is not None:
+        return cached
     
+    problems = []
     for field, old_spec in old_struct.items():
-        current_path = f"{path}.{field}" if path else field
-        
         if field not in new_struct:
-            errors.append(f"Missing required field: '{current_path}'")
+            problems.append(((field,), None))
             continue
         
         new_spec = new_struct[field]
         
         # Check type compatibility
         if old_spec['type'] != new_spec['type']:
-            errors.append(f"Type changed for '{current_path}': {old_spec['type']} -> {new_spec['type']}")
+            problems.append(((field,), (old_spec['type'], new_spec['type'])))
             continue
         
         # Recursively check nested structures
         if old_spec['type'] == 'dict' and 'fields' in old_spec:
-            nested_errors = check_field_compatibility(
-                old_spec['fields'], 
-                new_spec.get('fields', {}), 
-                current_path
+            nested = _find_incompatibilities(
+                old_spec['fields'],
+                new_spec.get('fields', _NO_FIELDS),
+                memo
             )
-            errors.extend(nested_errors)
+            for sub_parts, type_change in nested:
+                problems.append(((field,) + sub_parts, type_change))
+    
+    problems = tuple(problems)
+    memo[key] = problems
+    return problems
+
+def check_field_compatibility(old_struct, new_struct, path_parts=()):
+    """Check if new structure is compatible with old structure.
+    
+    Sub-structure pairs are compared once and memoized by identity, which pays
+    off when both structures have been passed through intern_structure().
+    """
+    errors = []
+    
+    # Dotted paths are only materialized for fields that actually fail
+    for rel_parts, type_change in _find_incompatibilities(old_struct, new_struct, {}):
+        current_path = '.'.join(path_parts + rel_parts)
+        if type_change is None:
+            errors.append(f"Missing required field: '{current_path}'")
+        else:
+            errors.append(f"Type changed for '{current_path}': {type_change[0]} -> {type_change[1]}")
     
     return errors
 
+def _strictly_equal(a, b):
+    """Equality that also requires matching types at every node, so 1, 1.0 and True differ."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_strictly_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(_strictly_equal, a, b))
+    return a == b
+
+def same_apart_from_version(current, previous):
+    """Return True if two schemas are identical, types included, once 'version' is ignored."""
+    if current.keys() != previous.keys():
+        return False
+    return all(
+        _strictly_equal(current[key], previous[key]) for key in current if key != 'version'
+    )
+
 def get_latest_schema_version():
     """Get the most recent schema version from schemas directory."""
-    schemas_dir = Path(__file__).parent.parent / 'schemas'
-    if not schemas_dir.exists():
+    if not SCHEMAS_DIR.exists():
         return None
     
-    schema_files = sorted(schemas_dir.glob('v*.yaml'))
+    schema_files = []
+    with os.scandir(SCHEMAS_DIR) as entries:
+        for entry in entries:
+            if not (entry.name.startswith('v') and entry.name.endswith('.yaml')):
+                continue
+            try:
+                # 'v1.10.yaml' -> (1, 10)
+                schema_files.append((_parse_ver(entry.name[1:-5]), entry.path))
+            except ValueError:
+                continue  # Not an archived version, e.g. 'v1.1-draft.yaml'
     if not schema_files:
         return None
     
-    return schema_files[-1]
+    # Single pass for the maximum
+    return Path(max(schema_files)[1])
 
 def main():
     """Main compatibility check function."""
-    template_path = Path(__file__).parent.parent / 'template.yaml'
-    
     # Load current template
     try:
-        current_template = load_yaml(template_path)
+        current_template = load_yaml(TEMPLATE_PATH)
     except Exception as e:
         print(f"Error loading template.yaml: {e}")
         sys.exit(1)
@@ -105,21 +198,24 @@ def main():
         print(f"Error loading previous schema: {e}")
         sys.exit(1)
     
-    # Extract structures
-    current_struct = get_schema_structure(current_template)
-    previous_struct = get_schema_structure(previous_schema)
-    
-    # Check compatibility
-    errors = check_field_compatibility(previous_struct, current_struct)
-    
-    if errors:
-        print("Backwards compatibility check failed!")
-        print("\nThe following issues were found:")
-        for error in errors:
-            print(f"  - {error}")
-        print("\nTo maintain backwards compatibility, all fields from previous versions must remain.")
-        print("You can add new optional fields, but cannot remove or change existing ones.")
-        sys.exit(1)
+    # A pure version bump cannot break compatibility, so skip the structural check
+    if not same_apart_from_version(current_template, previous_schema):
+        # Extract structures, sharing identical sub-structures between them
+        pool = {}
+        current_struct = intern_structure(get_schema_structure(current_template), pool)
+        previous_struct = intern_structure(get_schema_structure(previous_schema), pool)
+        
+        # Check compatibility
+        errors = check_field_compatibility(previous_struct, current_struct)
+        
+        if errors:
+            print("Backwards compatibility check failed!")
+            print("\nThe following issues were found:")
+            for error in errors:
+                print(f"  - {error}")
+            print("\nTo maintain backwards compatibility, all fields from previous versions must remain.")
+            print("You can add new optional fields, but cannot remove or change existing ones.")
+            sys.exit(1)
     
     # Check version increment
     current_version = current_template.get('version', '1.0')
@@ -0,0 +1,64 @@
+"""
+Shared YAML loading for the pre-commit scripts.
+Owns the JSON side-cache of archived schemas: its format, when it is written,
+and when a reader may trust it.
+"""
+import functools
+import json
+import yaml
+import os
+from pathlib import Path
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+@functools.lru_cache(maxsize=32)
+def _cached_load(path_str, mtime_ns, size):
+    """Parse a YAML or JSON file; mtime/size are part of the key so edits invalidate it."""
+    with open(path_str, 'r') as f:
+        if path_str.endswith('.json'):
+            return json.load(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+def _source_tag(st):
+    """Identity of a YAML file recorded in (and checked against) its JSON cache."""
+    return [st.st_mtime_ns, st.st_size]
+
+def load_yaml(file_path):
+    """Load YAML file and return its content (cached by path, mtime and size).
+    
+    The JSON side-cache next to an archived schema is used instead only when
+    it records exactly this YAML's mtime and size.
+    """
+    file_path = Path(file_path).resolve()
+    st = os.stat(file_path)
+    json_path = file_path.with_suffix('.json')
+    if json_path.exists():
+        json_st = os.stat(json_path)
+        try:
+            cached = _cached_load(str(json_path), json_st.st_mtime_ns, json_st.st_size)
+        except ValueError:
+            cached = None  # Corrupt cache; fall back to the YAML
+        if isinstance(cached, dict) and cached.get('source') == _source_tag(st):
+            return cached['schema']
+    return _cached_load(str(file_path), st.st_mtime_ns, st.st_size)
+
+def write_json_cache(yaml_path, data):
+    """Write the JSON side-cache for yaml_path, whose parsed content is data.
+    
+    Nothing is written unless JSON round-trips data exactly (e.g. dates or
+    non-string keys would not). Returns whether the cache was written.
+    """
+    try:
+        round_trips = json.loads(json.dumps(data)) == data
+    except (TypeError, ValueError):
+        round_trips = False
+    if not round_trips:
+        return False
+    
+    yaml_path = Path(yaml_path)
+    cache = {'source': _source_tag(os.stat(yaml_path)), 'schema': data}
+    yaml_path.with_suffix('.json').write_text(json.dumps(cache))
+    return True
@@ -5,52 +5,92 @@ YAML Validator for Cohort Configuration Files
 This tool validates user YAML implementations against the template schema.
 It checks for required fields, correct types, and valid values.
 """
+import functools
+import os
 import yaml
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+_ROOT = Path(__file__).resolve().parent
+TEMPLATE_PATH = _ROOT / 'template.yaml'
+SCHEMAS_DIR = _ROOT / 'schemas'
+
+@functools.lru_cache(maxsize=32)
+def _cached_load(path_str, mtime_ns, size):
+    """Parse a YAML file; mtime/size are part of the key so edits invalidate it."""
+    with open(path_str, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 class YAMLValidator:
+    # Placeholder types used in the template, mapped to accepted Python types
+    _TYPE_MAP = {
+        '<int>': (int,),
+        '<string>': (str,),
+        '<column_name_or_index>': (str, int),
+    }
+    _TYPE_ERR_TEMPLATE = {
+        expected_type: f"Field '%s': Expected {expected_type}, got %s"
+        for expected_type in _TYPE_MAP
+    }
+    _REQUIRED_FIELDS = frozenset({'cohort', 'task', 'task_variation'})
+    
     def __init__(self, schema_version: str = None):
         """Initialize validator with optional specific schema version."""
         self.schema_version = schema_version
         self.template = self._load_template()
+        self._compile_template()
         self.errors = []
         self.warnings = []
     
     def _load_template(self) -> Dict[str, Any]:
         """Load the template schema (either current or specific version)."""
         if self.schema_version:
-            schema_path = Path(__file__).parent / 'schemas' / f'v{self.schema_version}.yaml'
+            schema_path = SCHEMAS_DIR / f'v{self.schema_version}.yaml'
             if not schema_path.exists():
                 raise ValueError(f"Schema version {self.schema_version} not found")
         else:
-            schema_path = Path(__file__).parent / 'template.yaml'
+            schema_path = TEMPLATE_PATH
+        
+        st = os.stat(schema_path)
+        return _cached_load(str(schema_path.resolve()), st.st_mtime_ns, st.st_size)
+    
+    def _compile_template(self) -> None:
+        """Precompute how each template field is checked so validate() needn't re-inspect it."""
+        fields = []
+        self._typed_fields = {}
+        self._list_fields = {}
+        
+        for field, template_value in self.template.items():
+            if field == 'version':
+                continue  # Skip version field
+            
+            fields.append(field)
+            if isinstance(template_value, str) and template_value.startswith('<'):
+                self._typed_fields[field] = template_value
+            elif isinstance(template_value, list):
+                self._list_fields[field] = template_value
         
-        with open(schema_path, 'r') as f:
-            return yaml.safe_load(f)
+        self._fields = tuple(fields)
+        self._template_fields = frozenset(fields)
     
     def _validate_type(self, value: Any, expected_type: str, field_name: str) -> bool:
         """Validate that a value matches the expected type."""
-        type_map = {
-            '<int>': int,
-            '<string>': str,
-            '<column_name_or_index>': (str, int),
-        }
-        
-        if expected_type in type_map:
-            expected_types = type_map[expected_type]
-            if not isinstance(expected_types, tuple):
-                expected_types = (expected_types,)
-            
-            if not isinstance(value, expected_types):
-                self.errors.append(
-                    f"Field '{field_name}': Expected {expected_type}, got {type(value).__name__}"
-                )
-                return False
+        expected_types = self._TYPE_MAP.get(expected_type)
+        if expected_types is None or isinstance(value, expected_types):
+            return True
         
-        return True
+        self.errors.append(
+            self._TYPE_ERR_TEMPLATE[expected_type] % (field_name, value.__class__.__name__)
+        )
+        return False
     
     def _validate_column_spec(self, spec: Any, field_name: str) -> bool:
         """Validate column specification (can be name, index, or range)."""
@@ -88,6 +128,9 @@ class YAMLValidator:
         
         # Validate each item in the list
         for i, item in enumerate(value):
+            # Plain names/indexes are always valid; skip building the item label
+            if isinstance(item, (str, int)):
+                continue
             if not self._validate_column_spec(item, f"{field_name}[{i}]"):
                 return False
         
@@ -101,7 +144,7 @@ class YAMLValidator:
         # Load the YAML file
         try:
             with open(yaml_path, 'r') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
         except Exception as e:
             self.errors.append(f"Failed to parse YAML: {e}")
             return False, self.errors, self.warnings
@@ -110,29 +153,30 @@ class YAMLValidator:
             self.errors.append("YAML must contain a dictionary at the root level")
             return False, self.errors, self.warnings
         
-        # Check required fields from template
-        for field, template_value in self.template.items():
-            if field == 'version':
-                continue  # Skip version field
+        # Single pass over the document: type-check known fields, collect unknown ones
+        unknown_fields = []
+        known_count = 0
+        for field, value in data.items():
+            if field not in self._template_fields:
+                unknown_fields.append(field)
+                continue
             
-            if field not in data:
-                # Check if it's a required field
-                if field in ['cohort', 'task', 'task_variation']:
+            known_count += 1
+            expected_type = self._typed_fields.get(field)
+            if expected_type is not None:
+                self._validate_type(value, expected_type, field)
+            elif field in self._list_fields:
+                self._validate_list_field(data, field, self._list_fields[field])
+        
+        # Report template fields the document doesn't provide
+        if known_count < len(self._fields):
+            for field in self._fields:
+                if field in data:
+                    continue
+                if field in self._REQUIRED_FIELDS:
                     self.errors.append(f"Missing required field: '{field}'")
                 else:
                     self.warnings.append(f"Optional field '{field}' not provided")
-                continue
-            
-            # Validate field type
-            if isinstance(template_value, str) and template_value.startswith('<'):
-                self._validate_type(data[field], template_value, field)
-            elif isinstance(template_value, list):
-                self._validate_list_field(data, field, template_value)
-        
-        # Check for unknown fields
-        template_fields = set(self.template.keys()) - {'version'}
-        data_fields = set(data.keys())
-        unknown_fields = data_fields - template_fields
         
         if unknown_fields:
             self.warnings.append(f"Unknown fields found: {', '.join(unknown_fields)}")
@@ -143,15 +187,82 @@ class YAMLValidator:
         
         return len(self.errors) == 0, self.errors, self.warnings
 
+# Per-process validator for batch mode, built once by _init_worker
+_worker_validator = None
+
+def _init_worker(schema_version: str) -> None:
+    """Build the validator a batch worker process reuses for every file."""
+    global _worker_validator
+    _worker_validator = YAMLValidator(schema_version=schema_version)
+
+def _validate_in_worker(yaml_path: Path) -> Tuple[bool, List[str], List[str]]:
+    """Validate one file with the worker's validator."""
+    return _worker_validator.validate(yaml_path)
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def _collect_yaml_files(paths: List[Path]) -> List[Path]:
+    """Expand directories into the YAML files they contain.
+    
+    Hidden files (e.g. .pre-commit-config.yaml) and the template itself are
+    skipped, since they are not cohort configurations.
+    """
+    yaml_files = []
+    for path in paths:
+        if path.is_dir():
+            yaml_files.extend(sorted(
+                p for p in path.iterdir()
+                if p.suffix in ('.yaml', '.yml')
+                and not p.name.startswith('.')
+                and p.resolve() != TEMPLATE_PATH
+            ))
+        else:
+            yaml_files.append(path)
+    return yaml_files
+
+def _report(yaml_path: Path, is_valid: bool, errors: List[str], warnings: List[str],
+            args: argparse.Namespace) -> bool:
+    """Print the outcome for one file and return whether it passed."""
+    if errors:
+        print("❌ Validation FAILED\n")
+        print("Errors:")
+        for error in errors:
+            print(f"  - {error}")
+    
+    if warnings:
+        if errors:
+            print()
+        print("Warnings:")
+        for warning in warnings:
+            print(f"  ⚠️  {warning}")
+    
+    if is_valid and not (args.strict and warnings):
+        print(f"✅ Validation PASSED for '{yaml_path.name}'")
+        if args.schema_version:
+            print(f"   (validated against schema version {args.schema_version})")
+        return True
+    
+    return False
+
 def main():
     """Main function for command-line usage."""
     parser = argparse.ArgumentParser(
         description="Validate YAML configuration files against the template schema"
     )
     parser.add_argument(
-        'yaml_file',
+        'yaml_files',
         type=Path,
-        help='Path to the YAML file to validate'
+        nargs='+',
+        metavar='yaml_file',
+        help='Path to a YAML file (or a directory of YAML files) to validate'
     )
     parser.add_argument(
         '--schema-version',
@@ -163,11 +274,23 @@ def main():
         action='store_true',
         help='Treat warnings as errors'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=_positive_int,
+        default=None,
+        help='Worker processes when validating several files (default: CPU count)'
+    )
     
     args = parser.parse_args()
     
-    if not args.yaml_file.exists():
-        print(f"Error: File '{args.yaml_file}' not found")
+    for yaml_path in args.yaml_files:
+        if not yaml_path.exists():
+            print(f"Error: File '{yaml_path}' not found")
+            sys.exit(1)
+    
+    yaml_files = _collect_yaml_files(args.yaml_files)
+    if not yaml_files:
+        print("Error: No YAML files found")
         sys.exit(1)
     
     # Create validator and run validation
@@ -177,29 +300,28 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
     
-    is_valid, errors, warnings = validator.validate(args.yaml_file)
+    if len(yaml_files) == 1 or args.jobs == 1:
+        results = [validator.validate(yaml_path) for yaml_path in yaml_files]
+    else:
+        # Each worker parses the template once and reuses it for all its files
+        with ProcessPoolExecutor(
+            max_workers=min(args.jobs or os.cpu_count() or 1, len(yaml_files)),
+            initializer=_init_worker,
+            initargs=(args.schema_version,),
+        ) as executor:
+            results = list(executor.map(_validate_in_worker, yaml_files))
     
     # Display results
-    if errors:
-        print("❌ Validation FAILED\n")
-        print("Errors:")
-        for error in errors:
-            print(f"  - {error}")
+    all_passed = True
+    for i, (yaml_path, result) in enumerate(zip(yaml_files, results)):
+        if len(yaml_files) > 1:
+            if i:
+                print()
+            print(f"== {yaml_path} ==")
+        if not _report(yaml_path, *result, args):
+            all_passed = False
     
-    if warnings:
-        if errors:
-            print()
-        print("Warnings:")
-        for warning in warnings:
-            print(f"  ⚠️  {warning}")
-    
-    if is_valid and not (args.strict and warnings):
-        print(f"✅ Validation PASSED for '{args.yaml_file.name}'")
-        if args.schema_version:
-            print(f"   (validated against schema version {args.schema_version})")
-        sys.exit(0)
-    else:
-        sys.exit(1)
+    sys.exit(0 if all_passed else 1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()